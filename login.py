@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 
 import base64
-import getpass
+import binascii
+import functools
 import hashlib
 import hmac
 import os
-import platform
-import subprocess
+import re
+import secrets
 import sys
+import tempfile
+import time
 
 
 # ANSI Color codes for terminal
@@ -46,15 +49,77 @@ class Colors:
     BRIGHT_WHITE = "\033[97m"
 
 
+# Clear screen and scrollback, then home the cursor (what `clear` emits)
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"
+
+# Box borders shared by the screens below
+BORDER_EQ_60 = "=" * 60
+BORDER_DOUBLE_68 = "═" * 68
+BORDER_LIGHT_68 = "─" * 68
+BORDER_LIGHT_80 = "─" * 80
+BORDER_DASH_45 = "-" * 45
+
+
+# PBKDF2 parameters for stored password hashes. Records are stored as
+# "v2$alg$iterations$salt$hash" with unpadded urlsafe base64 salt and hash.
+# Older hex records are "alg$iterations$salt$hash", "alg$salt$hash"
+# (100,000 iterations) and bare "salt$hash" (additionally sha256).
+# sha256 stays the default: with SHA-NI it outruns sha512 per iteration.
+PASSWORD_FORMAT = "v2"
+PBKDF2_HASH = "sha256"
+PBKDF2_ITERATIONS = 100000  # Floor for new hashes and count for old records
+PBKDF2_MAX_ITERATIONS = 1000000  # Ceiling, in case calibration misjudges
+PBKDF2_TARGET_MS = 250
+
+# One "user:password:role" record per line, surrounding whitespace ignored
+CREDENTIAL_LINE_RE = re.compile(
+    r"^[^\S\n]*([^:\n]*):([^:\n]*):([^:\n]*?)[^\S\n]*$", re.MULTILINE
+)
+
+
+def derive_key(
+    password_bytes, salt, hash_name=PBKDF2_HASH, iterations=PBKDF2_ITERATIONS
+):
+    """Derive a PBKDF2-HMAC key; OpenSSL precomputes the HMAC pads internally."""
+    return hashlib.pbkdf2_hmac(hash_name, password_bytes, salt, iterations)
+
+
+def b64_encode_field(raw):
+    """Encode bytes as unpadded urlsafe base64 for a credentials field."""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def b64_decode_field(text):
+    """Decode an unpadded urlsafe base64 credentials field."""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+@functools.lru_cache(maxsize=None)
+def calibrate_iterations(target_ms=PBKDF2_TARGET_MS, hash_name=PBKDF2_HASH):
+    """Return an iteration count that takes about target_ms on this machine."""
+    sample = 10000
+    # Best of a few runs, so one preempted sample does not skew the result
+    elapsed_ns = None
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        derive_key(b"calibration", bytes(16), hash_name, sample)
+        run_ns = time.perf_counter_ns() - start
+        elapsed_ns = run_ns if elapsed_ns is None else min(elapsed_ns, run_ns)
+    iterations = sample * target_ms * 1_000_000 // max(elapsed_ns, 1)
+    # Round down to a tidy value within the floor and ceiling
+    iterations = iterations // 10000 * 10000
+    return min(PBKDF2_MAX_ITERATIONS, max(PBKDF2_ITERATIONS, iterations))
+
+
 # Prevent execution on Windows OS
-if platform.system() == "Windows":
-    print("=" * 60)
+if os.name == "nt":
+    print(BORDER_EQ_60)
     print("ERROR: Esta aplicación no es compatible con Windows")
-    print("=" * 60)
+    print(BORDER_EQ_60)
     print("\nEste sistema POS está diseñado exclusivamente para sistemas Unix")
     print("(Linux, macOS, BSD, etc.) y no puede ejecutarse en Windows.")
     print("\nPor favor usa un sistema Linux o macOS para ejecutar esta aplicación.")
-    print("=" * 60)
+    print(BORDER_EQ_60)
     sys.exit(1)
 
 
@@ -63,85 +128,177 @@ class UserManager:
 
     def __init__(self, credentials_file=".credentials"):
         self.credentials_file = credentials_file
+        # Parsed credentials, reused until the file's mtime changes
+        self._users = None
+        self._users_mtime = 0
         self.ensure_credentials_file()
 
     def ensure_credentials_file(self):
         """Ensure the credentials file exists."""
-        if not os.path.exists(self.credentials_file):
+        try:
+            with open(self.credentials_file, "rb"):
+                pass
+        except FileNotFoundError:
             print(
                 f"Advertencia: {self.credentials_file} no encontrado. Creando usuario admin por defecto."
             )
             self.create_user("admin", "password", "admin", save_now=True)
 
-    def hash_password(self, password, salt=None):
+    def hash_password(self, password, salt=None, hash_name=PBKDF2_HASH):
         """Hash a password using pbkdf2_hmac."""
+        if isinstance(password, str):
+            password = password.encode("utf-8")
         if salt is None:
-            salt = os.urandom(16)
+            salt = secrets.token_bytes(16)
         else:
             if isinstance(salt, str):
                 salt = bytes.fromhex(salt)
-        
-        # 100,000 iterations of SHA256
-        pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100000)
-        return salt.hex() + "$" + pwd_hash.hex()
+
+        iterations = calibrate_iterations(hash_name=hash_name)
+        pwd_hash = derive_key(password, salt, hash_name, iterations)
+        return (
+            f"{PASSWORD_FORMAT}${hash_name}${iterations}$"
+            f"{b64_encode_field(salt)}${b64_encode_field(pwd_hash)}"
+        )
+
+    def needs_rehash(self, stored_password):
+        """Return True if a stored password is not in the current hash format."""
+        fields = stored_password.split("$")
+        return (
+            len(fields) != 5
+            or fields[0] != PASSWORD_FORMAT
+            or fields[1] != PBKDF2_HASH
+        )
 
     def verify_password(self, stored_password, provided_password):
         """Verify a stored password against a provided password."""
         try:
             # Check if it's an old base64 password (no '$' separator and looks like base64)
             if "$" not in stored_password:
-                # Attempt to decode as base64 to see if it's a legacy password
-                try:
-                    decoded = base64.b64decode(stored_password).decode("utf-8")
-                    # If successful, compare plaintexts
-                    return decoded == provided_password
-                except Exception:
-                    return False
-            
-            salt_hex, hash_hex = stored_password.split("$")
-            salt = bytes.fromhex(salt_hex)
-            pwd_hash = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, 100000)
-            return hmac.compare_digest(pwd_hash.hex(), hash_hex)
+                decoded = self.decode_legacy_password(stored_password)
+                return decoded is not None and decoded == provided_password
+
+            fields = stored_password.split("$")
+            if fields[0] == PASSWORD_FORMAT:
+                _, hash_name, iterations_str, salt_b64, hash_b64 = fields
+                iterations = int(iterations_str)
+                salt = b64_decode_field(salt_b64)
+                expected = b64_decode_field(hash_b64)
+            else:
+                iterations = PBKDF2_ITERATIONS
+                if len(fields) == 2:
+                    # Pre-versioned record: implicit sha256
+                    hash_name = "sha256"
+                    salt_hex, hash_hex = fields
+                elif len(fields) == 3:
+                    hash_name, salt_hex, hash_hex = fields
+                else:
+                    hash_name, iterations_str, salt_hex, hash_hex = fields
+                    iterations = int(iterations_str)
+                salt = bytes.fromhex(salt_hex)
+                expected = bytes.fromhex(hash_hex)
+            pwd_hash = derive_key(
+                provided_password.encode("utf-8"), salt, hash_name, iterations
+            )
+            return hmac.compare_digest(pwd_hash, expected)
         except Exception:
             return False
 
+    def decode_legacy_password(self, stored_password):
+        """Decode a legacy base64 password, or return None if it is not one."""
+        try:
+            return binascii.a2b_base64(stored_password).decode("utf-8")
+        except Exception:
+            return None
+
+    def _invalidate(self):
+        """Drop the cached users so the next load re-reads the file."""
+        self._users = None
+        self._users_mtime = 0
+
     def load_users(self):
-        """Load all users from the credentials file."""
-        users = {}
+        """Load all users from the credentials file (cached by mtime)."""
+        try:
+            mtime = os.stat(self.credentials_file).st_mtime_ns
+        except FileNotFoundError:
+            self._invalidate()
+            return {}
+        if self._users is not None and mtime == self._users_mtime:
+            return self._users
+
         try:
             with open(self.credentials_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    parts = line.split(":")
-                    if len(parts) == 3:
-                        username, password_data, role = parts
-                        users[username] = {
-                            "password": password_data,
-                            "role": role,
-                        }
+                data = f.read()
         except FileNotFoundError:
-            pass
+            return {}
+
+        users = {
+            m[1]: {"password": m[2], "role": m[3]}
+            for m in CREDENTIAL_LINE_RE.finditer(data)
+        }
+        # Decode legacy base64 passwords once per load rather than per login
+        for record in users.values():
+            if "$" not in record["password"]:
+                record["legacy_plain"] = self.decode_legacy_password(
+                    record["password"]
+                )
+        self._users = users
+        self._users_mtime = mtime
         return users
 
     def save_users(self, users):
         """Save all users to the credentials file."""
-        with open(self.credentials_file, "w") as f:
-            for username, data in users.items():
-                f.write(f"{username}:{data['password']}:{data['role']}\n")
+        payload = "".join(
+            f"{username}:{data['password']}:{data['role']}\n"
+            for username, data in users.items()
+        ).encode("utf-8")
+
+        # Write to a sibling temp file and swap it in, so a crash mid-write
+        # never leaves a truncated credentials file behind. The data is
+        # fsynced before the rename, and the directory after it, so a power
+        # loss cannot leave an empty file or undo the rename either
+        directory = os.path.dirname(os.path.abspath(self.credentials_file))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".credentials.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.credentials_file)
+        except BaseException:
+            os.unlink(temp_path)
+            # Callers mutate the cached dict before saving; it no longer
+            # matches the file, so force a re-read
+            self._invalidate()
+            raise
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        self._users = users
+        self._users_mtime = os.stat(self.credentials_file).st_mtime_ns
 
     def authenticate(self, username, password):
         """Authenticate a user and return their role if successful."""
         users = self.load_users()
         if username in users:
-            stored_password = users[username]["password"]
-            if self.verify_password(stored_password, password):
+            user = users[username]
+            stored_password = user["password"]
+            if "legacy_plain" in user:
+                verified = (
+                    user["legacy_plain"] is not None
+                    and user["legacy_plain"] == password
+                )
+            else:
+                verified = self.verify_password(stored_password, password)
+            if verified:
                 # Check if migration from legacy format is needed
-                if "$" not in stored_password:
+                if self.needs_rehash(stored_password):
                     print(f"Migrando contraseña para usuario '{username}' a formato seguro...")
                     new_hash = self.hash_password(password)
-                    users[username]["password"] = new_hash
+                    user["password"] = new_hash
+                    user.pop("legacy_plain", None)
                     self.save_users(users)
                 
                 return users[username]["role"]
@@ -175,9 +332,8 @@ class UserManager:
         if username not in users:
             return False, "Usuario no encontrado."
 
-        if (
-            username == "admin"
-            and len([u for u in users if users[u]["role"] == "admin"]) == 1
+        if users[username]["role"] == "admin" and not any(
+            data["role"] == "admin" for u, data in users.items() if u != username
         ):
             return False, "No se puede eliminar el último usuario administrador."
 
@@ -192,6 +348,7 @@ class UserManager:
             return False, "Usuario no encontrado."
 
         users[username]["password"] = self.hash_password(new_password)
+        users[username].pop("legacy_plain", None)
         self.save_users(users)
         return True, "Contraseña cambiada exitosamente."
 
@@ -201,6 +358,101 @@ class UserManager:
         return users
 
 
+def format_menu_item(number, text, icon=""):
+    """Return a formatted menu item line."""
+    return f"  {Colors.BOLD}{Colors.CYAN}{number}.{Colors.RESET} {icon} {Colors.WHITE}{text}{Colors.RESET}"
+
+
+def format_section(title):
+    """Return a formatted section header."""
+    return f"\n{Colors.BOLD}{Colors.YELLOW}{title}{Colors.RESET}"
+
+
+def build_screen(lines):
+    """Join screen lines into one string ready for a single stdout write."""
+    return "\n".join(lines) + "\n"
+
+
+# Static screens, rendered once at import. Only the placeholders
+# ({title}, {user}) are filled in per redraw.
+HEADER_TEMPLATE = build_screen(
+    [
+        f"\n{Colors.BLUE}╔{BORDER_DOUBLE_68}╗{Colors.RESET}",
+        f"{Colors.BLUE}║{Colors.RESET}{Colors.BOLD}{Colors.CYAN}{{title:^68}}{Colors.RESET}{Colors.BLUE}║{Colors.RESET}",
+        f"{Colors.BLUE}╚{BORDER_DOUBLE_68}╝{Colors.RESET}",
+    ]
+)
+
+LOGIN_BANNER = build_screen(
+    [
+        f"\n{Colors.CYAN}{Colors.BOLD}",
+        BORDER_LIGHT_80,
+        f"{Colors.BRIGHT_WHITE}{'Xun-POS':^80}{Colors.RESET}",
+        BORDER_LIGHT_80,
+        f"{Colors.RESET}",
+        f"{Colors.WHITE}{'Punto de venta rápido, ligero y para Linux.'.center(80)}{Colors.RESET}",
+        f"{Colors.RESET}",
+        f"\n{Colors.BRIGHT_WHITE}╔{BORDER_DOUBLE_68}╗{Colors.RESET}",
+        f"{Colors.BRIGHT_WHITE}║{Colors.RESET}  {Colors.BOLD}Por favor ingresa tus credenciales{Colors.RESET}                              {Colors.BRIGHT_WHITE}║{Colors.RESET}",
+        f"{Colors.BRIGHT_WHITE}╚{BORDER_DOUBLE_68}╝{Colors.RESET}\n",
+    ]
+)
+
+ADMIN_MENU_TEMPLATE = build_screen(
+    [
+        f"\n{Colors.BRIGHT_BLACK}┌{BORDER_LIGHT_68}┐{Colors.RESET}",
+        f"{Colors.BRIGHT_BLACK}│{Colors.RESET} {Colors.BOLD}Sesión activa:{Colors.RESET} {Colors.CYAN}{{user}}{Colors.RESET} {Colors.BRIGHT_BLACK}(Administrador){Colors.RESET}                    {Colors.BRIGHT_BLACK}│{Colors.RESET}",
+        f"{Colors.BRIGHT_BLACK}└{BORDER_LIGHT_68}┘{Colors.RESET}",
+        format_section("OPERACIONES POS"),
+        format_menu_item("1", "Punto de Venta", ""),
+        format_menu_item("2", "Productos", ""),
+        format_menu_item("3", "Reportes", ""),
+        format_menu_item("4", "Configuración", ""),
+        format_section("GESTIÓN DE USUARIOS"),
+        format_menu_item("5", "Agregar Nuevo Usuario", ""),
+        format_menu_item("6", "Eliminar Usuario", ""),
+        format_menu_item("7", "Cambiar Contraseña", ""),
+        format_menu_item("8", "Listar Todos los Usuarios", ""),
+        format_section("SESIÓN"),
+        format_menu_item("9", "Cerrar Sesión", ""),
+        format_menu_item("0", "Salir", ""),
+    ]
+)
+
+CASHIER_MENU_TEMPLATE = build_screen(
+    [
+        f"\n{Colors.BRIGHT_BLACK}┌{BORDER_LIGHT_68}┐{Colors.RESET}",
+        f"{Colors.BRIGHT_BLACK}│{Colors.RESET} {Colors.BOLD}Sesión activa:{Colors.RESET} {Colors.CYAN}{{user}}{Colors.RESET} {Colors.BRIGHT_BLACK}(Cajero){Colors.RESET}                            {Colors.BRIGHT_BLACK}│{Colors.RESET}",
+        f"{Colors.BRIGHT_BLACK}└{BORDER_LIGHT_68}┘{Colors.RESET}",
+        format_section("OPERACIONES DISPONIBLES"),
+        format_menu_item("1", "Punto de Venta", ""),
+        format_menu_item("2", "Productos", ""),
+        format_section("SESIÓN"),
+        format_menu_item("3", "Cerrar Sesión", ""),
+        format_menu_item("0", "Salir", ""),
+    ]
+)
+
+# Display names for roles; anything that is not an admin shows as cashier
+ROLE_NAMES_ES = {"admin": "Administrador", "cashier": "Cajero"}
+
+
+def role_display_name(role):
+    """Return the Spanish display name for a role."""
+    return ROLE_NAMES_ES.get(role, "Cajero")
+
+
+# Per-row templates for the user listings; the escape codes are baked in
+# here so the loops only substitute the user fields.
+USER_ROLE_ROW_TEMPLATE = (
+    f"  {Colors.CYAN}{{user}}{Colors.RESET} {Colors.BRIGHT_BLACK}({{role}}){Colors.RESET}"
+)
+USER_NAME_ROW_TEMPLATE = f"  {Colors.CYAN}{{user}}{Colors.RESET}"
+USER_TABLE_ROW_TEMPLATE = (
+    f"{Colors.CYAN}{{user:<25}}{Colors.RESET} {Colors.WHITE}{{role:<20}}{Colors.RESET}"
+)
+
+
 class LoginSystem:
     """Main login system with menu interface."""
 
@@ -211,75 +463,48 @@ class LoginSystem:
 
     def clear_screen(self):
         """Clear the terminal screen."""
-        os.system("clear" if os.name != "nt" else "cls")
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
+
+    def draw_screen(self, frame):
+        """Clear the terminal and draw a full frame in one write."""
+        sys.stdout.write(CLEAR_SCREEN + frame)
+        sys.stdout.flush()
 
     def print_header(self, title):
         """Print a formatted header with colors."""
-        print("\n" + Colors.BLUE + "╔" + "═" * 68 + "╗" + Colors.RESET)
-        print(
-            Colors.BLUE
-            + "║"
-            + Colors.RESET
-            + Colors.BOLD
-            + Colors.CYAN
-            + f"{title:^68}"
-            + Colors.RESET
-            + Colors.BLUE
-            + "║"
-            + Colors.RESET
-        )
-        print(Colors.BLUE + "╚" + "═" * 68 + "╝" + Colors.RESET)
+        sys.stdout.write(HEADER_TEMPLATE.format(title=title))
 
     def print_box(self, content, color=Colors.WHITE):
         """Print content in a box."""
-        lines = content.split("\n")
-        max_len = max(len(line) for line in lines)
-
-        print(color + "┌" + "─" * (max_len + 2) + "┐" + Colors.RESET)
+        lines = content.splitlines() or [content]
+        max_len = 0
         for line in lines:
-            print(
-                color
-                + "│"
-                + Colors.RESET
-                + f" {line:<{max_len}} "
-                + color
-                + "│"
-                + Colors.RESET
-            )
-        print(color + "└" + "─" * (max_len + 2) + "┘" + Colors.RESET)
+            line_len = len(line)
+            if line_len > max_len:
+                max_len = line_len
+
+        border = "─" * (max_len + 2)
+        left = f"{color}│{Colors.RESET} "
+        right = f" {color}│{Colors.RESET}"
+        box = [f"{color}┌{border}┐{Colors.RESET}"]
+        box.extend(f"{left}{line:<{max_len}}{right}" for line in lines)
+        box.append(f"{color}└{border}┘{Colors.RESET}")
+        sys.stdout.write(build_screen(box))
 
     def print_menu_item(self, number, text, icon=""):
         """Print a formatted menu item."""
-        print(
-            f"  {Colors.BOLD}{Colors.CYAN}{number}.{Colors.RESET} {icon} {Colors.WHITE}{text}{Colors.RESET}"
-        )
+        print(format_menu_item(number, text, icon))
 
     def print_section(self, title):
         """Print a section header."""
-        print(f"\n{Colors.BOLD}{Colors.YELLOW}{title}{Colors.RESET}")
+        print(format_section(title))
 
     def login(self):
         """Handle user login."""
-        self.clear_screen()
+        import getpass
 
-        # ASCII Art Logo
-        print(f"\n{Colors.CYAN}{Colors.BOLD}")
-        print("─" * 80)
-        print(f"{Colors.BRIGHT_WHITE}{'Xun-POS':^80}{Colors.RESET}")
-        print("─" * 80)
-        print(f"{Colors.RESET}")
-        print(f"{Colors.WHITE}{'Punto de venta rápido, ligero y para Linux.'.center(80)}{Colors.RESET}")
-        print(f"{Colors.RESET}")
-
-        print(
-            f"\n{Colors.BRIGHT_WHITE}╔════════════════════════════════════════════════════════════════════╗{Colors.RESET}"
-        )
-        print(
-            f"{Colors.BRIGHT_WHITE}║{Colors.RESET}  {Colors.BOLD}Por favor ingresa tus credenciales{Colors.RESET}                              {Colors.BRIGHT_WHITE}║{Colors.RESET}"
-        )
-        print(
-            f"{Colors.BRIGHT_WHITE}╚════════════════════════════════════════════════════════════════════╝{Colors.RESET}\n"
-        )
+        self.draw_screen(LOGIN_BANNER)
 
         username = input(f"{Colors.CYAN}Usuario:{Colors.RESET} ").strip()
         password = getpass.getpass(f"{Colors.CYAN}Contraseña:{Colors.RESET} ")
@@ -289,12 +514,10 @@ class LoginSystem:
         if role:
             self.current_user = username
             self.current_role = role
-            role_es = "Administrador" if role == "admin" else "Cajero"
-            print(
-                f"\n{Colors.BG_GREEN}{Colors.BOLD} ÉXITO {Colors.RESET} {Colors.GREEN}¡Inicio de sesión exitoso!{Colors.RESET}"
-            )
-            print(
-                f"{Colors.BRIGHT_WHITE}Bienvenido, {Colors.BOLD}{Colors.CYAN}{username}{Colors.RESET} {Colors.BRIGHT_BLACK}({role_es}){Colors.RESET}"
+            role_es = role_display_name(role)
+            sys.stdout.write(
+                f"\n{Colors.BG_GREEN}{Colors.BOLD} ÉXITO {Colors.RESET} {Colors.GREEN}¡Inicio de sesión exitoso!{Colors.RESET}\n"
+                f"{Colors.BRIGHT_WHITE}Bienvenido, {Colors.BOLD}{Colors.CYAN}{username}{Colors.RESET} {Colors.BRIGHT_BLACK}({role_es}){Colors.RESET}\n"
             )
             input(f"\n{Colors.YELLOW}Presiona Enter para continuar...{Colors.RESET}")
             return True
@@ -310,29 +533,7 @@ class LoginSystem:
     def admin_menu(self):
         """Display and handle admin menu."""
         while True:
-            self.clear_screen()
-
-            print(f"\n{Colors.BRIGHT_BLACK}┌{'─' * 68}┐{Colors.RESET}")
-            print(
-                f"{Colors.BRIGHT_BLACK}│{Colors.RESET} {Colors.BOLD}Sesión activa:{Colors.RESET} {Colors.CYAN}{self.current_user}{Colors.RESET} {Colors.BRIGHT_BLACK}(Administrador){Colors.RESET}                    {Colors.BRIGHT_BLACK}│{Colors.RESET}"
-            )
-            print(f"{Colors.BRIGHT_BLACK}└{'─' * 68}┘{Colors.RESET}")
-
-            self.print_section("OPERACIONES POS")
-            self.print_menu_item("1", "Punto de Venta", "")
-            self.print_menu_item("2", "Productos", "")
-            self.print_menu_item("3", "Reportes", "")
-            self.print_menu_item("4", "Configuración", "")
-
-            self.print_section("GESTIÓN DE USUARIOS")
-            self.print_menu_item("5", "Agregar Nuevo Usuario", "")
-            self.print_menu_item("6", "Eliminar Usuario", "")
-            self.print_menu_item("7", "Cambiar Contraseña", "")
-            self.print_menu_item("8", "Listar Todos los Usuarios", "")
-
-            self.print_section("SESIÓN")
-            self.print_menu_item("9", "Cerrar Sesión", "")
-            self.print_menu_item("0", "Salir", "")
+            self.draw_screen(ADMIN_MENU_TEMPLATE.format(user=self.current_user))
 
             choice = input(
                 f"\n{Colors.BOLD}{Colors.GREEN}>{Colors.RESET} {Colors.WHITE}Ingresa tu opción:{Colors.RESET} "
@@ -372,21 +573,7 @@ class LoginSystem:
     def cashier_menu(self):
         """Display and handle cashier menu."""
         while True:
-            self.clear_screen()
-
-            print(f"\n{Colors.BRIGHT_BLACK}┌{'─' * 68}┐{Colors.RESET}")
-            print(
-                f"{Colors.BRIGHT_BLACK}│{Colors.RESET} {Colors.BOLD}Sesión activa:{Colors.RESET} {Colors.CYAN}{self.current_user}{Colors.RESET} {Colors.BRIGHT_BLACK}(Cajero){Colors.RESET}                            {Colors.BRIGHT_BLACK}│{Colors.RESET}"
-            )
-            print(f"{Colors.BRIGHT_BLACK}└{'─' * 68}┘{Colors.RESET}")
-
-            self.print_section("OPERACIONES DISPONIBLES")
-            self.print_menu_item("1", "Punto de Venta", "")
-            self.print_menu_item("2", "Productos", "")
-
-            self.print_section("SESIÓN")
-            self.print_menu_item("3", "Cerrar Sesión", "")
-            self.print_menu_item("0", "Salir", "")
+            self.draw_screen(CASHIER_MENU_TEMPLATE.format(user=self.current_user))
 
             choice = input(
                 f"\n{Colors.BOLD}{Colors.GREEN}>{Colors.RESET} {Colors.WHITE}Ingresa tu opción:{Colors.RESET} "
@@ -413,6 +600,8 @@ class LoginSystem:
 
     def run_python_app(self, script_name):
         """Run a Python GUI application."""
+        import subprocess
+
         if not os.path.exists(script_name):
             print(f"\n{Colors.RED}Error: {script_name} no encontrado.{Colors.RESET}")
             input(f"\n{Colors.YELLOW}Presiona Enter para continuar...{Colors.RESET}")
@@ -420,17 +609,24 @@ class LoginSystem:
 
         try:
             print(f"\n{Colors.CYAN}Iniciando {script_name}...{Colors.RESET}")
+            argv = [sys.executable, script_name]
             # Pass user role to pos_gui.py for role-based access control
             if script_name == "pos_gui.py" and self.current_role:
-                subprocess.run([sys.executable, script_name, self.current_role])
-            else:
-                subprocess.run([sys.executable, script_name])
+                argv.append(self.current_role)
+            # GUIs stay in their own process so a crash or sys.exit() in one
+            # cannot take down the login session. This terminal process has no
+            # Tk or other C-level descriptors, and every file Python opens is
+            # non-inheritable (PEP 446), so close_fds=False passes on nothing
+            # but stdio while letting subprocess use posix_spawn().
+            subprocess.run(argv, close_fds=False)
         except Exception as e:
             print(f"\n{Colors.RED}Error ejecutando {script_name}: {e}{Colors.RESET}")
             input(f"\n{Colors.YELLOW}Presiona Enter para continuar...{Colors.RESET}")
 
     def add_user_menu(self):
         """Menu for adding a new user."""
+        import getpass
+
         self.clear_screen()
         self.print_header("AGREGAR NUEVO USUARIO")
 
@@ -482,7 +678,7 @@ class LoginSystem:
 
         success, message = self.user_manager.create_user(username, password, role)
         if success:
-            role_es = "Administrador" if role == "admin" else "Cajero"
+            role_es = role_display_name(role)
             print(
                 f"\n{Colors.BG_GREEN}{Colors.BOLD} ÉXITO {Colors.RESET} {Colors.GREEN}{message}{Colors.RESET}"
             )
@@ -510,10 +706,8 @@ class LoginSystem:
 
         print(f"\n{Colors.BOLD}{Colors.YELLOW}Usuarios actuales:{Colors.RESET}")
         for username, data in users.items():
-            role_es = "Administrador" if data["role"] == "admin" else "Cajero"
-            print(
-                f"  {Colors.CYAN}{username}{Colors.RESET} {Colors.BRIGHT_BLACK}({role_es}){Colors.RESET}"
-            )
+            role_es = role_display_name(data["role"])
+            print(USER_ROLE_ROW_TEMPLATE.format(user=username, role=role_es))
 
         username = input(
             f"\n{Colors.GREEN}>{Colors.RESET} Ingresa el usuario a eliminar {Colors.BRIGHT_BLACK}(o presiona Enter para cancelar){Colors.RESET}: "
@@ -554,6 +748,8 @@ class LoginSystem:
 
     def change_password_menu(self):
         """Menu for changing a user's password."""
+        import getpass
+
         self.clear_screen()
         self.print_header("CAMBIAR CONTRASEÑA")
 
@@ -565,7 +761,7 @@ class LoginSystem:
 
         print(f"\n{Colors.BOLD}{Colors.YELLOW}Usuarios actuales:{Colors.RESET}")
         for username, data in users.items():
-            print(f"  {Colors.CYAN}{username}{Colors.RESET}")
+            print(USER_NAME_ROW_TEMPLATE.format(user=username))
 
         username = input(
             f"\n{Colors.GREEN}>{Colors.RESET} Ingresa el nombre de usuario {Colors.BRIGHT_BLACK}(o presiona Enter para cancelar){Colors.RESET}: "
@@ -615,15 +811,17 @@ class LoginSystem:
         if not users:
             print(f"\n{Colors.RED}No se encontraron usuarios.{Colors.RESET}")
         else:
-            print(
-                f"\n{Colors.BOLD}{Colors.CYAN}{'Usuario':<25} {'Rol':<20}{Colors.RESET}"
-            )
-            print(f"{Colors.BRIGHT_BLACK}{'-' * 45}{Colors.RESET}")
-            for username, data in users.items():
-                role_es = "Administrador" if data["role"] == "admin" else "Cajero"
-                print(
-                    f"{Colors.CYAN}{username:<25}{Colors.RESET} {Colors.WHITE}{role_es:<20}{Colors.RESET}"
+            table = [
+                f"\n{Colors.BOLD}{Colors.CYAN}{'Usuario':<25} {'Rol':<20}{Colors.RESET}",
+                f"{Colors.BRIGHT_BLACK}{BORDER_DASH_45}{Colors.RESET}",
+            ]
+            table.extend(
+                USER_TABLE_ROW_TEMPLATE.format(
+                    user=username, role=role_display_name(data["role"])
                 )
+                for username, data in users.items()
+            )
+            sys.stdout.write(build_screen(table))
 
         input(f"\n{Colors.YELLOW}Presiona Enter para continuar...{Colors.RESET}")
 
@@ -1,16 +1,21 @@
-import base64
+import bisect
 import csv
 import fcntl
+import html
+import io
+import itertools
 import json
 import os
-import platform
+import re
 import subprocess
 import sys
 import tempfile
+import threading
 import tkinter as tk
-import webbrowser
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from pathlib import Path
+from tkinter import font as tkfont
 from tkinter import messagebox, ttk
 try:
     from thermal_printer import ThermalPrinter
@@ -18,7 +23,7 @@ except ImportError:
     ThermalPrinter = None
 
 # Prevent execution on Windows OS
-if platform.system() == "Windows":
+if os.name == "nt":
     print("=" * 60)
     print("ERROR: Esta aplicación no es compatible con Windows")
     print("=" * 60)
@@ -29,6 +34,128 @@ if platform.system() == "Windows":
     sys.exit(1)
 
 
+# Last parsed settings.json and the (inode, size, mtime) it was read at
+_settings_cache = {"stamp": None, "settings": None}
+
+# Sale rows for products with this many units or fewer are flagged
+LOW_STOCK_THRESHOLD = 5
+
+# Spanish day and month names for the clock
+DAYS_ES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+MONTHS_ES = (
+    "enero",
+    "febrero",
+    "marzo",
+    "abril",
+    "mayo",
+    "junio",
+    "julio",
+    "agosto",
+    "septiembre",
+    "octubre",
+    "noviembre",
+    "diciembre",
+)
+
+# Delay before refreshing search suggestions, so a burst of keystrokes
+# (or a barcode scanner) triggers one search instead of one per key
+SUGGESTION_DELAY_MS = 80
+
+# Key releases that cannot change the search text
+NON_EDITING_KEYS = frozenset(
+    {
+        "Shift_L",
+        "Shift_R",
+        "Control_L",
+        "Control_R",
+        "Alt_L",
+        "Alt_R",
+        "Super_L",
+        "Super_R",
+        "Meta_L",
+        "Meta_R",
+        "Caps_Lock",
+        "Num_Lock",
+        "ISO_Level3_Shift",
+        "Left",
+        "Right",
+        "Up",
+        "Down",
+        "Home",
+        "End",
+        "Prior",
+        "Next",
+        "Tab",
+        "Escape",
+        "Insert",
+    }
+)
+
+
+# Header rows for the append-only logs, as csv.writer would write them;
+# append_to_log writes them when it finds a log empty
+SALES_LOG_HEADER = b"timestamp,barcode,nombre,cantidad,precio_unitario,precio_total\r\n"
+CASH_FLOW_LOG_HEADER = b"timestamp,tipo,monto,concepto\r\n"
+
+
+def csv_field(value):
+    """Quote a text field the way csv.writer's default dialect does."""
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+# Smallest price step in products.csv
+CENT = Decimal("0.01")
+
+
+def price_to_cents(price_str):
+    """Parse a products.csv price into integer cents.
+
+    The text is read as a Decimal so "0.285" rounds half up to 29 cents
+    exactly. Raises ValueError for text that is not a finite amount
+    ("abc", "inf", "1e400").
+    """
+    try:
+        price = Decimal(price_str)
+        if not price.is_finite():
+            raise InvalidOperation
+        return int(price.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+    except InvalidOperation:
+        raise ValueError(f"Precio inválido: {price_str!r}") from None
+
+
+def file_stamp(fd):
+    """Identify the current contents of an open file by inode, size and mtime."""
+    st = os.fstat(fd)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def iter_csv_records(data):
+    """Yield (row, line_span) for each CSV record in raw file bytes.
+
+    line_span is the (start, end) byte range of the record's line, line
+    ending included, when the record fits on one line; None otherwise.
+    """
+    lines = data.splitlines(keepends=True)
+    starts = [0, *itertools.accumulate(map(len, lines))]
+    reader = csv.reader(map(bytes.decode, lines))
+    first = 0
+    for row in reader:
+        last = reader.line_num
+        if last - first == 1 and not (
+            b'"' in lines[first] and b"\r" in lines[first]
+        ):
+            yield row, (starts[first], starts[last])
+        else:
+            # A quoted field may hold a line break; re-read the record with
+            # the newline translation text mode would have applied to it
+            text = b"".join(lines[first:last]).decode("utf-8")
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            yield next(csv.reader(io.StringIO(text, newline="\n"))), None
+        first = last
+
+
 class POS_GUI(tk.Tk):
     def __init__(self, user_role="admin"):
         super().__init__()
@@ -39,16 +166,36 @@ class POS_GUI(tk.Tk):
         self.is_fullscreen = False  # Track fullscreen state
 
         self.settings = self.load_settings()
+        # Byte range of each product's line in products.csv, indexed on the
+        # first sale and again whenever the file no longer matches the stamp
+        self._product_lines = {}
+        self._products_stamp = None
         self.products = self.load_products()
-        self.sale_items = {}  # Dictionary to handle quantities: {barcode: {'name': str, 'price': float, 'qty': int}}
+        self._build_search_index()
+        # Barcodes at or below LOW_STOCK_THRESHOLD, kept current by _set_stock
+        self._low_stock = {
+            code
+            for code, product in self.products.items()
+            if product["inventario"] <= LOW_STOCK_THRESHOLD
+        }
+        self._last_suggestions = None
+        self._suggestions_after_id = None
+        self.sale_items = {}  # Dictionary to handle quantities: {barcode: {'name': str, 'price': int (cents), 'qty': int}}
+        # Treeview rows shown for the sale,
+        # {barcode: (iid, total, price_str, qty, price, tags)},
+        # kept in sync with sale_items by update_sale_list
+        self._sale_rows = {}
+        self._sale_total = 0  # Sum of the row totals above, in cents
+        self._ui_refresh_id = None  # Pending after_idle sale-list refresh
         self.last_added_barcode = (
             None  # Track the last added product for quick re-addition
         )
 
+        self._log_fds = {}  # {path: (fd, inode)} for append_to_log
         self.create_styles()
-        self.init_sales_log()
-        self.init_cash_flow_log()
         self.create_widgets()
+        self._last_date_str = None
+        self._last_time_str = None
         self.update_time()  # Start the clock
         self.product_combobox.focus()  # Focus on product combobox
 
@@ -56,7 +203,11 @@ class POS_GUI(tk.Tk):
         self.bind("<F11>", self.toggle_fullscreen)
 
     def load_settings(self):
-        """Load settings from JSON file with default fallback."""
+        """Load settings from JSON file with default fallback.
+
+        The parsed result is cached until settings.json changes, so this is
+        cheap enough to call again whenever fresh settings are wanted.
+        """
         default_settings = {
             "business_name": "Mi Negocio",
             "address": "Chignahuapan",
@@ -64,90 +215,97 @@ class POS_GUI(tk.Tk):
             "cashier_name": "Dan",
         }
         try:
+            st = os.stat("settings.json")
+            stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+            if stamp == _settings_cache["stamp"]:
+                return _settings_cache["settings"]
             with open("settings.json", "r", encoding="utf-8") as f:
                 loaded = json.load(f)
                 default_settings.update(loaded)  # Merge with defaults
+                _settings_cache["stamp"] = stamp
+                _settings_cache["settings"] = default_settings
                 return default_settings
         except (FileNotFoundError, json.JSONDecodeError):
-            return default_settings
+            # Keep what we had if the file vanished or is mid-write
+            return _settings_cache["settings"] or default_settings
 
     def update_time(self):
-        """Update date and time labels every second in Spanish format."""
+        """Update date and time labels in Spanish format.
+
+        The clock only shows minutes, so it wakes up once per minute and
+        skips the label updates when the text is unchanged.
+        """
         now = datetime.now()
 
-        # Spanish date formatting
-        days = [
-            "Lunes",
-            "Martes",
-            "Miércoles",
-            "Jueves",
-            "Viernes",
-            "Sábado",
-            "Domingo",
-        ]
-        months = [
-            "enero",
-            "febrero",
-            "marzo",
-            "abril",
-            "mayo",
-            "junio",
-            "julio",
-            "agosto",
-            "septiembre",
-            "octubre",
-            "noviembre",
-            "diciembre",
-        ]
-        day_of_week = days[now.weekday()]
-        day = now.day
-        month = months[now.month - 1]
-        year = now.year
-
-        date_str = f"{day_of_week.capitalize()}, {day} de {month} del {year}"
+        date_str = f"{DAYS_ES[now.weekday()]}, {now.day} de {MONTHS_ES[now.month - 1]} del {now.year}"
         time_str = now.strftime("%H:%M")
 
-        self.date_label.config(text=date_str)
-        self.time_label.config(text=time_str)
-
-        self.after(1000, self.update_time)
-
-    def init_sales_log(self):
-        """Initialize sales.csv with headers if it doesn't exist."""
-        if not os.path.exists("sales.csv"):
-            with open("sales.csv", "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(
-                    [
-                        "timestamp",
-                        "barcode",
-                        "nombre",
-                        "cantidad",
-                        "precio_unitario",
-                        "precio_total",
-                    ]
-                )
+        if date_str != self._last_date_str:
+            self._last_date_str = date_str
+            self.date_label.config(text=date_str)
+        if time_str != self._last_time_str:
+            self._last_time_str = time_str
+            self.time_label.config(text=time_str)
+
+        # Reschedule just past the next minute boundary
+        ms_to_next_minute = 60000 - (now.second * 1000 + now.microsecond // 1000)
+        self.after(ms_to_next_minute + 50, self.update_time)
 
     def log_sale(self):
         """Log the current sale to sales.csv."""
         timestamp = datetime.now().isoformat()
-        with open("sales.csv", "a", newline="", encoding="utf-8") as f:
-            fcntl.flock(f, fcntl.LOCK_EX)
-            try:
-                writer = csv.writer(f)
-                for barcode, item in self.sale_items.items():
-                    writer.writerow(
-                        [
-                            timestamp,
-                            barcode,
-                            item["name"],
-                            item["qty"],
-                            item["price"],
-                            item["qty"] * item["price"],
-                        ]
-                    )
-            finally:
-                fcntl.flock(f, fcntl.LOCK_UN)
+        # Format the whole sale up front so it goes out in one write
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [
+                timestamp,
+                barcode,
+                item["name"],
+                item["qty"],
+                item["price"] / 100,
+                item["qty"] * item["price"] / 100,
+            ]
+            for barcode, item in self.sale_items.items()
+        )
+        self.append_to_log("sales.csv", SALES_LOG_HEADER, buffer.getvalue())
+
+    def append_to_log(self, path, header, text):
+        """Append text to a CSV log through a long-lived O_APPEND descriptor.
+
+        The write happens under an exclusive flock, since the reports window
+        reads these logs under a shared one. The log is created on first use,
+        with the header row written under the same lock; if the file was
+        deleted or replaced since it was opened (e.g. archived), it is
+        recreated and reopened rather than writing into the old inode.
+        """
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            inode = None
+        fd, fd_inode = self._log_fds.get(path, (None, None))
+        opened = fd is None or inode != fd_inode
+        if opened:
+            if fd is not None:
+                os.close(fd)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            self._log_fds[path] = (fd, os.fstat(fd).st_ino)
+
+        data = text.encode("utf-8")
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if opened and os.fstat(fd).st_size == 0:
+                data = header + data  # New log: header row first
+            data = memoryview(data)
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close_logs(self):
+        """Close the descriptors kept open by append_to_log."""
+        for fd, _ in self._log_fds.values():
+            os.close(fd)
+        self._log_fds.clear()
 
     def update_inventory(self):
         """Update product inventory in products.csv after a sale."""
@@ -162,6 +320,10 @@ class POS_GUI(tk.Tk):
                 fcntl.flock(file, fcntl.LOCK_EX)
                 
                 try:
+                    # Usual case: patch just the sold products' fields
+                    if self._patch_inventory(file.fileno()):
+                        return
+
                     reader = csv.reader(file)
                     lines = list(reader)
                     
@@ -169,36 +331,38 @@ class POS_GUI(tk.Tk):
                         messagebox.showerror("Error", "El archivo de productos está vacío.")
                         return
 
-                    header = lines[0]
-                    product_lines = lines[1:]
-
-                    # Create a dictionary for quick lookup by barcode
-                    products_dict = {row[0]: row for row in product_lines}
+                    # Row index by barcode (last one wins if a code repeats);
+                    # rows are patched in place, so no copy of the file is built
+                    row_index = {
+                        lines[i][0]: i for i in range(1, len(lines)) if lines[i]
+                    }
                     
                     # Track if any changes were made
                     changes_made = False
+                    new_stocks = {}
 
                     # Update quantities
                     for barcode, item in self.sale_items.items():
-                        if barcode in products_dict:
+                        if barcode in row_index:
+                            row = lines[row_index[barcode]]
                             try:
                                 # Assuming 'inventario' is the 4th column (index 3)
-                                current_stock = int(products_dict[barcode][3])
+                                current_stock = int(row[3])
                                 new_stock = current_stock - item["qty"]
-                                products_dict[barcode][3] = str(new_stock)
+                                row[3] = str(new_stock)
+                                new_stocks[barcode] = new_stock
                                 changes_made = True
                             except (ValueError, IndexError):
                                 print(f"Warning: Could not update stock for barcode {barcode}")
                     
                     if changes_made:
-                        # Reconstruct the lines in the original order
-                        updated_lines = [header] + [products_dict.get(row[0], row) for row in product_lines]
-                        
                         # Rewind and write
                         file.seek(0)
                         writer = csv.writer(file)
-                        writer.writerows(updated_lines)
+                        writer.writerows(lines)
                         file.truncate()
+                        for barcode, stock in new_stocks.items():
+                            self._set_stock(barcode, stock)
                         
                 finally:
                     # Always unlock
@@ -207,8 +371,67 @@ class POS_GUI(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo actualizar el inventario: {e}")
 
+    def _patch_inventory(self, fd):
+        """Overwrite the sold products' inventario fields in place.
+
+        Only possible when every sold product sits on a plain unquoted line
+        and its new count has the same width as the old one; returns False
+        without writing anything otherwise, so the caller can rewrite the file.
+        """
+        if file_stamp(fd) != self._products_stamp:
+            # First sale, or products.csv was rewritten since it was indexed
+            self._index_inventory(fd)
+
+        patches = []
+        for barcode, item in self.sale_items.items():
+            span = self._product_lines.get(barcode)
+            if span is None:
+                return False
+            line_start, line_end = span
+            line = os.pread(fd, line_end - line_start, line_start).rstrip(b"\r\n")
+            fields = line.split(b",")
+            if b'"' in line or len(fields) < 4 or fields[0] != barcode.encode("utf-8"):
+                return False
+            try:
+                current_stock = int(fields[3])
+            except ValueError:
+                return False
+            new_stock = current_stock - item["qty"]
+            new_field = str(new_stock).encode("ascii")
+            if len(new_field) != len(fields[3]):
+                return False
+            field_start = line_start + len(fields[0]) + len(fields[1]) + len(fields[2]) + 3
+            patches.append((barcode, new_stock, field_start, new_field))
+
+        for barcode, new_stock, offset, field in patches:
+            os.pwrite(fd, field, offset)
+            self._set_stock(barcode, new_stock)
+        self._products_stamp = file_stamp(fd)
+        return True
+
+    def _set_stock(self, barcode, stock):
+        """Mirror a stock count just written to products.csv in memory."""
+        product = self.products.get(barcode)
+        if product is not None:
+            product["inventario"] = stock
+            if stock <= LOW_STOCK_THRESHOLD:
+                self._low_stock.add(barcode)
+            else:
+                self._low_stock.discard(barcode)
+
+    def _index_inventory(self, fd):
+        """Record where each product's line sits in products.csv as it is now."""
+        stamp = file_stamp(fd)
+        records = iter_csv_records(os.pread(fd, stamp[1], 0))
+        next(records, None)  # Skip header
+        self._product_lines = {row[0]: span for row, span in records if row}
+        self._products_stamp = stamp
+
     def load_products(self):
-        """Load products from CSV file."""
+        """Load products from CSV file.
+
+        Prices are kept as integer cents so sale totals add up exactly.
+        """
         products = {}
         filepath = Path("products.csv")
         if not filepath.exists():
@@ -226,7 +449,7 @@ class POS_GUI(tk.Tk):
                     if len(row) >= 4:  # At least barcode, name, price, inventario
                         barcode, name, price_str, inventario_str = row[0:4]
                         try:
-                            price = float(price_str)
+                            price = price_to_cents(price_str)
                             inventario = int(inventario_str)
                             products[barcode] = {
                                 "name": name.strip(),
@@ -240,7 +463,7 @@ class POS_GUI(tk.Tk):
                     elif len(row) >= 3:  # Fallback for rows without inventario
                         barcode, name, price_str = row[0:3]
                         try:
-                            price = float(price_str)
+                            price = price_to_cents(price_str)
                             products[barcode] = {
                                 "name": name.strip(),
                                 "price": price,
@@ -333,6 +556,12 @@ class POS_GUI(tk.Tk):
             background=BG_COLOR,
             foreground=SUCCESS_COLOR,
         )
+        style.configure(
+            "Error.TLabel",
+            font=("Arial", 12, "bold"),
+            background=BG_COLOR,
+            foreground=DANGER_COLOR,
+        )
 
         # Custom Button styles
         style.configure("Accent.TButton", foreground=WHITE, background=ACCENT_COLOR)
@@ -400,8 +629,8 @@ class POS_GUI(tk.Tk):
         # Bind F12 to exit application
         self.bind("<F12>", lambda event: self.destroy())
         # Bind '+' key to add one more of the last product
-        self.bind("<plus>", lambda event: self.add_one_more_last_product())
-        self.bind("<KP_Add>", lambda event: self.add_one_more_last_product())
+        self.bind("<plus>", self.add_one_more_last_product)
+        self.bind("<KP_Add>", self.add_one_more_last_product)
         # Bind Tab to focus next widget
         self.bind("<Tab>", lambda event: self.focus_next_widget())
 
@@ -468,7 +697,7 @@ class POS_GUI(tk.Tk):
         self.product_combobox.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.product_combobox.bind("<Return>", self.add_product)
         self.product_combobox.bind("<KP_Enter>", self.add_product)
-        self.product_combobox.bind("<KeyRelease>", self.show_suggestions)
+        self.product_combobox.bind("<KeyRelease>", self.schedule_suggestions)
         self.product_combobox.bind("<<ComboboxSelected>>", self.add_product)
 
     def _create_middle_frame(self, parent):
@@ -573,18 +802,30 @@ class POS_GUI(tk.Tk):
 
     def open_settings_window(self):
         """Open settings GUI in a new process."""
-        if Path("settings_gui.py").exists():
-            subprocess.Popen([sys.executable, "settings_gui.py"])
+        self._launch_app("settings_gui.py")
 
     def open_products_window(self):
         """Open products GUI in a new process."""
-        if Path("products_gui.py").exists():
-            subprocess.Popen([sys.executable, "products_gui.py"])
+        self._launch_app("products_gui.py")
 
     def open_reports_window(self):
         """Open reports GUI in a new process."""
-        if Path("reports_gui.py").exists():
-            subprocess.Popen([sys.executable, "reports_gui.py"])
+        self._launch_app("reports_gui.py")
+
+    def _launch_app(self, script_name):
+        """Start another GUI script in its own process, if it exists.
+
+        The child gets its own session, so it outlives the POS and ignores
+        a Ctrl+C sent to the POS terminal. A daemon thread waits on it so
+        closed windows do not linger as zombies. With no preexec_fn and
+        close_fds=True, subprocess starts it with vfork(), so the Tk
+        process's memory is not copied.
+        """
+        if Path(script_name).exists():
+            process = subprocess.Popen(
+                [sys.executable, script_name], start_new_session=True
+            )
+            threading.Thread(target=process.wait, daemon=True).start()
 
     def open_entry_window(self):
         """Open entry window for cash inflow."""
@@ -597,39 +838,72 @@ class POS_GUI(tk.Tk):
     def log_cash_flow(self, transaction_type, amount, concept):
         """Log cash flow transaction to CSV."""
         timestamp = datetime.now().isoformat()
-        with open("cash_flow.csv", "a", newline="", encoding="utf-8") as f:
-            fcntl.flock(f, fcntl.LOCK_EX)
-            try:
-                writer = csv.writer(f)
-                writer.writerow([timestamp, transaction_type, amount, concept])
-            finally:
-                fcntl.flock(f, fcntl.LOCK_UN)
+        # Only the concept is free text; the other fields never need quoting
+        line = f"{timestamp},{transaction_type},{amount},{csv_field(concept)}\r\n"
+        self.append_to_log("cash_flow.csv", CASH_FLOW_LOG_HEADER, line)
+
+    def schedule_suggestions(self, event=None):
+        """Refresh suggestions once typing pauses."""
+        if event is not None and event.keysym in NON_EDITING_KEYS:
+            return
+        self.cancel_suggestions()
+        self._suggestions_after_id = self.after(
+            SUGGESTION_DELAY_MS, self.show_suggestions
+        )
 
-    def init_cash_flow_log(self):
-        """Initialize cash_flow.csv with headers if it doesn't exist."""
-        if not os.path.exists("cash_flow.csv"):
-            with open("cash_flow.csv", "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["timestamp", "tipo", "monto", "concepto"])
+    def cancel_suggestions(self):
+        """Drop a pending suggestions refresh, if any."""
+        if self._suggestions_after_id is not None:
+            self.after_cancel(self._suggestions_after_id)
+            self._suggestions_after_id = None
 
     def show_suggestions(self, event=None):
         """Show product suggestions based on search term."""
+        self._suggestions_after_id = None
         search_term = self.product_combobox.get().lower().strip()
         if len(search_term) < 1:
+            self._last_suggestions = []
             self.product_combobox["values"] = []
             return
 
         suggestions = []
+        text = self._search_text
+        starts = self._search_starts
+        pos = text.find(search_term)
+        while pos != -1 and len(suggestions) < 10:  # Limit to 10 suggestions
+            index = (bisect.bisect_right(starts, pos) - 1) // 2
+            code = self._search_codes[index]
+            suggestions.append(f"{self.products[code]['name']} ({code})")
+            # Resume at the next product so each one is listed once
+            pos = text.find(search_term, starts[2 * index + 2])
+
+        # Setting the values is a Tk round-trip; skip it if nothing changed
+        if suggestions != self._last_suggestions:
+            self._last_suggestions = suggestions
+            self.product_combobox["values"] = suggestions
+
+    def _build_search_index(self):
+        """Index product codes and names for searching.
+
+        The lowercased code and name of every product are joined into one
+        string, so a search is a single str.find; bisect over the segment
+        offsets maps each hit back to its product. Lowercased names also map
+        to their barcode for add_product.
+        """
+        segments = []
+        barcode_by_name = {}
         for code, product in self.products.items():
-            if search_term in code.lower() or search_term in product["name"].lower():
-                suggestions.append(f"{product['name']} ({code})")
-
-        if suggestions:
-            self.product_combobox["values"] = suggestions[
-                :10
-            ]  # Limit to 10 suggestions
-        else:
-            self.product_combobox["values"] = []
+            name = product["name"].lower()
+            segments.append(code.lower())
+            segments.append(name)
+            # First product wins when names repeat, as the old scan did
+            barcode_by_name.setdefault(name, code)
+        self._barcode_by_name = barcode_by_name
+        self._search_codes = list(self.products)
+        self._search_text = "\x00".join(segments)
+        self._search_starts = list(
+            itertools.accumulate((len(segment) + 1 for segment in segments), initial=0)
+        )
 
     def hide_suggestions(self, event=None):
         """No need to hide for Combobox."""
@@ -641,6 +915,7 @@ class POS_GUI(tk.Tk):
 
     def add_product(self, event=None):
         """Add product to sale by barcode or name."""
+        self.cancel_suggestions()
         search_term = self.product_combobox.get().strip()
         if not search_term:
             return
@@ -657,11 +932,10 @@ class POS_GUI(tk.Tk):
         barcode = base_term
         if not product:
             # Search by name (case-insensitive)
-            for code, prod in self.products.items():
-                if prod["name"].lower() == base_term.lower():
-                    product = prod
-                    barcode = code
-                    break
+            code = self._barcode_by_name.get(base_term.lower())
+            if code is not None:
+                product = self.products[code]
+                barcode = code
 
         if product:
             if barcode in self.sale_items:
@@ -674,8 +948,7 @@ class POS_GUI(tk.Tk):
                 }
 
             self.last_added_barcode = barcode  # Update last added product
-            self.update_sale_list()
-            self.update_total()
+            self._schedule_ui_refresh()
             self.product_combobox.delete(0, tk.END)
             self.product_combobox.focus()
         else:
@@ -683,12 +956,11 @@ class POS_GUI(tk.Tk):
             self.after(2000, lambda: self.status_label.config(text=""))
             self.product_combobox.focus()
 
-    def add_one_more_last_product(self):
+    def add_one_more_last_product(self, event=None):
         """Adds one more quantity of the last product added to the sale."""
         if self.last_added_barcode and self.last_added_barcode in self.sale_items:
             self.sale_items[self.last_added_barcode]["qty"] += 1
-            self.update_sale_list()
-            self.update_total()
+            self._schedule_ui_refresh()
         else:
             self.status_label.config(
                 text="No hay producto previo para añadir más cantidad."
@@ -708,8 +980,7 @@ class POS_GUI(tk.Tk):
     def clear_sale(self):
         """Clear the current sale."""
         self.sale_items = {}
-        self.update_sale_list()
-        self.update_total()
+        self._schedule_ui_refresh()
         self.product_combobox.focus()
 
     def navigate_tree(self, direction):
@@ -736,47 +1007,80 @@ class POS_GUI(tk.Tk):
             barcode = self.tree.item(item_id, "tags")[0]
             if barcode in self.sale_items:
                 del self.sale_items[barcode]
-                self.update_sale_list()
-                self.update_total()
+                self._schedule_ui_refresh()
         else:
             messagebox.showwarning("Advertencia", "Seleccione un ítem para eliminar.")
 
+    def _schedule_ui_refresh(self):
+        """Refresh the sale list and total once the pending events are handled.
+
+        Rapid scans queue a single refresh instead of one per product.
+        """
+        if self._ui_refresh_id is None:
+            self._ui_refresh_id = self.after_idle(self._do_ui_refresh)
+
+    def _do_ui_refresh(self):
+        """Run a pending sale list refresh now."""
+        if self._ui_refresh_id is not None:
+            self.after_cancel(self._ui_refresh_id)
+            self._ui_refresh_id = None
+        self.update_sale_list()
+        self.update_total()
+
     def update_sale_list(self):
-        """Update the Treeview with current sale items."""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Sync the Treeview with current sale items, touching only changed rows."""
+        rows = self._sale_rows
+        sale_total = self._sale_total
+        removed = [barcode for barcode in rows if barcode not in self.sale_items]
+        if removed:
+            iids = []
+            for barcode in removed:
+                row = rows.pop(barcode)
+                iids.append(row[0])
+                sale_total -= row[1]
+            self.tree.delete(*iids)
 
-        # Insert current items
         for barcode, item in self.sale_items.items():
-            total_price = item["qty"] * item["price"]
-            tags = (barcode,)
-            if self.products.get(barcode, {}).get("inventario", 0) <= 5:
-                tags = (barcode, "low_stock")
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    barcode,
-                    item["name"],
-                    item["qty"],
-                    f"${item['price']:.2f}",
-                    f"${total_price:.2f}",
-                ),
-                tags=tags,
-            )
+            qty = item["qty"]
+            price = item["price"]
+            tags = (barcode, "low_stock") if barcode in self._low_stock else (barcode,)
+
+            row = rows.get(barcode)
+            if row is not None:
+                iid, total_price, price_str, old_qty, old_price, old_tags = row
+                if qty == old_qty and price == old_price and tags == old_tags:
+                    continue  # Unchanged row: no formatting, no Tk call
+                if price != old_price:
+                    price_str = f"${price / 100:.2f}"
+                sale_total -= total_price
+            else:
+                price_str = f"${price / 100:.2f}"
+
+            total_price = qty * price
+            sale_total += total_price
+            total_str = f"${total_price / 100:.2f}"
+            values = (barcode, item["name"], qty, price_str, total_str)
+            if row is None:
+                iid = self.tree.insert("", tk.END, values=values, tags=tags)
+            else:
+                self.tree.item(iid, values=values, tags=tags)
+            rows[barcode] = (iid, total_price, price_str, qty, price, tags)
+        self._sale_total = sale_total
 
     def update_total(self):
-        """Update the total label and return total."""
-        total = sum(item["qty"] * item["price"] for item in self.sale_items.values())
-        self.total_label.config(text=f"Total: ${total:.2f}")
+        """Update the total label and return total, in cents."""
+        # Kept by update_sale_list; integer cents, so it never drifts
+        total = self._sale_total
+        self.total_label.config(text=f"Total: ${total / 100:.2f}")
         return total
 
     def show_payment_window(self):
         """Show payment window if there are items."""
+        if self._ui_refresh_id is not None:
+            self._do_ui_refresh()
         total = self.update_total()
         if total > 0:
-            PaymentWindow(self, total)
+            PaymentWindow(self, total / 100)
         else:
             messagebox.showwarning("Venta Vacía", "No hay productos en la venta.")
             self.product_combobox.focus()
@@ -791,123 +1095,12 @@ class POS_GUI(tk.Tk):
     def on_closing(self):
         """Handle window closing."""
         self.log_sale() if self.sale_items else None
+        self.close_logs()
         self.destroy()
 
 
-class PaymentWindow(tk.Toplevel):
-    """Payment window for finalizing sales."""
-
-    def __init__(self, parent, total):
-        super().__init__(parent)
-        self.parent = parent
-        self.total = total
-        self.change_value = 0.0
-        self.amount_paid = 0.0
-
-        self.title("Finalizar Venta")
-        self.geometry("550x500")
-        self.transient(parent)
-        self.grab_set()
-        self.configure(bg="#f0f0f0")
-        self.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-        self.create_payment_styles()
-        self.create_widgets()
-
-    def create_payment_styles(self):
-        """Create custom styles for payment window with larger fonts."""
-        style = ttk.Style(self)
-        # Green button for Calculate Change and Print
-        style.configure(
-            "PaymentGreen.TButton",
-            font=("Arial", 14, "bold"),
-            padding=12,
-            background="#28A745",
-            foreground="white",
-        )
-        style.map(
-            "PaymentGreen.TButton",
-            background=[("active", "#218838"), ("disabled", "#cccccc")],
-            foreground=[("disabled", "#666666")],
-        )
-        # Red button for Close
-        style.configure(
-            "PaymentRed.TButton",
-            font=("Arial", 14, "bold"),
-            padding=12,
-            background="#DC3545",
-            foreground="white",
-        )
-        style.map(
-            "PaymentRed.TButton",
-            background=[("active", "#c82333"), ("disabled", "#cccccc")],
-            foreground=[("disabled", "#666666")],
-        )
-        # Blue button for Close
-        style.configure(
-            "PaymentBlue.TButton",
-            font=("Arial", 14, "bold"),
-            padding=12,
-            background="#007BFF",
-            foreground="white",
-        )
-        style.map(
-            "PaymentBlue.TButton",
-            background=[("active", "#0069D9"), ("disabled", "#cccccc")],
-            foreground=[("disabled", "#666666")],
-        )
-
-    def create_widgets(self):
-        """Create payment window widgets."""
-        main_frame = ttk.Frame(self, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-
-        ttk.Label(
-            main_frame,
-            text=f"Total a pagar: ${self.total:.2f}",
-            font=("Arial", 34, "bold"),
-        ).pack(pady=10)
-
-        ttk.Label(main_frame, text="Monto recibido:", font=("Arial", 18, "bold")).pack(
-            pady=5
-        )
-        self.amount_entry = ttk.Entry(main_frame, font=("Arial", 24))
-        self.amount_entry.pack(pady=5)
-        self.amount_entry.focus()
-        self.amount_entry.bind("<Return>", self.calculate_change)
-        self.amount_entry.bind("<KP_Enter>", self.calculate_change)
-
-        self.calculate_button = ttk.Button(
-            main_frame,
-            text="Calcular Cambio",
-            command=self.calculate_change,
-            style="PaymentGreen.TButton",
-        )
-        self.calculate_button.pack(pady=(10, 10))
-
-        self.cancel_button = ttk.Button(
-            main_frame,
-            text="Esc - Cancelar",
-            command=self.destroy,
-            style="PaymentRed.TButton",
-        )
-        self.cancel_button.pack(pady=(0, 25))
-
-        # Bind Escape key
-        self.bind("<Escape>", lambda e: self.destroy())
-
-        self.change_label = ttk.Label(
-            main_frame, text="", style="Success.TLabel", font=("Arial", 36, "bold")
-        )
-        self.change_label.pack(pady=15)
-
-        # These buttons will be created after calculating change
-        self.print_button = None
-        self.close_button = None
-
-    def get_ticket_template(self):
-        """Return the ticket HTML template as a string. Robust: embedded in code, no file dependency."""
-        return """<!DOCTYPE html>
+# Ticket HTML, embedded so printing has no file dependency
+TICKET_TEMPLATE = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -996,88 +1189,227 @@ class PaymentWindow(tk.Toplevel):
 </body>
 </html>"""
 
-    def calculate_change(self, event=None):
-        """Calculate change and enable print/finalize if sufficient."""
-        try:
-            self.amount_paid = float(self.amount_entry.get())
-            if self.amount_paid < self.total:
-                messagebox.showerror(
-                    "Error", "El monto recibido es menor que el total.", parent=self
-                )
-                return
-            self.change_value = self.amount_paid - self.total
-            self.change_label.config(text=f"Cambio: ${self.change_value:.2f}")
-
-            # Disable entry and hide calculate button
-            self.amount_entry.config(state="disabled")
-            self.amount_entry.unbind("<Return>")
-            self.amount_entry.unbind("<KP_Enter>")
-            self.calculate_button.pack_forget()
-            if hasattr(self, 'cancel_button'):
-                self.cancel_button.pack_forget()
-
-            # Create and show the action buttons
-            self.show_action_buttons()
-        except ValueError:
-            messagebox.showerror(
-                "Error", "Monto inválido. Por favor, ingrese un número.", parent=self
+# {{name}} placeholders in TICKET_TEMPLATE; the CSS braces rule out str.format
+TICKET_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Arial fonts for the payment and cash dialogs, {(size, weight): Font}
+_dialog_fonts = {}
+
+
+def dialog_font(widget, size, weight="normal"):
+    """Return a shared Arial Font, created on first use for this size."""
+    font = _dialog_fonts.get((size, weight))
+    if font is None:
+        font = tkfont.Font(root=widget, family="Arial", size=size, weight=weight)
+        _dialog_fonts[size, weight] = font
+    return font
+
+
+# Plain decimal amounts, e.g. "12", "12.50", ".5". A comma is accepted only
+# as the decimal separator with one or two digits after it ("12,5", "12,50"),
+# so a grouped value like "1,000" is rejected rather than read as 1.0
+AMOUNT_RE = re.compile(r"\d+(?:\.\d*)?|\.\d+|\d+,\d{1,2}")
+
+
+def parse_amount(text):
+    """Return the amount typed in an entry as a float, or None if invalid."""
+    text = text.strip()
+    if not AMOUNT_RE.fullmatch(text):
+        return None
+    return float(text.replace(",", "."))
+
+
+class PaymentWindow(tk.Toplevel):
+    """Payment window for finalizing sales."""
+
+    # ttk styles live in the Tk interpreter, so they are configured once
+    _styles_ready = False
+    # Button colors: {name: (background, active background)}
+    BUTTON_COLORS = {
+        "Green": ("#28A745", "#218838"),  # Calculate Change and Print
+        "Red": ("#DC3545", "#c82333"),  # Cancel
+        "Blue": ("#007BFF", "#0069D9"),  # Close
+    }
+
+    def __init__(self, parent, total):
+        super().__init__(parent)
+        self.parent = parent
+        self.total = total
+        self.total_text = f"${total:.2f}"  # Shared by the label and the ticket
+        self.change_value = 0.0
+        self.change_text = ""
+        self.amount_paid = 0.0
+
+        self.title("Finalizar Venta")
+        self.geometry("550x500")
+        self.transient(parent)
+        self.grab_set()
+        self.configure(bg="#f0f0f0")
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        self.create_payment_styles()
+        self.create_widgets()
+
+    def create_payment_styles(self):
+        """Create custom styles for payment window with larger fonts."""
+        if PaymentWindow._styles_ready:
+            return
+        style = ttk.Style(self)
+        # Shared look; each color variant below only sets its background
+        style.configure(
+            "Payment.TButton",
+            font=("Arial", 14, "bold"),
+            padding=12,
+            foreground="white",
+        )
+        style.map("Payment.TButton", foreground=[("disabled", "#666666")])
+        for color, (background, active) in self.BUTTON_COLORS.items():
+            style.configure(f"{color}.Payment.TButton", background=background)
+            style.map(
+                f"{color}.Payment.TButton",
+                background=[("active", active), ("disabled", "#cccccc")],
             )
+        PaymentWindow._styles_ready = True
 
-    def show_action_buttons(self):
-        """Show Print and Close buttons after calculating change."""
-        # Get the parent frame
-        main_frame = self.change_label.master
+    def create_widgets(self):
+        """Create payment window widgets."""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Create Print Ticket button (F2 - Green)
+        ttk.Label(
+            main_frame,
+            text=f"Total a pagar: {self.total_text}",
+            font=dialog_font(self, 34, "bold"),
+        ).pack(pady=10)
+
+        ttk.Label(
+            main_frame, text="Monto recibido:", font=dialog_font(self, 18, "bold")
+        ).pack(pady=5)
+        self.amount_entry = ttk.Entry(main_frame, font=dialog_font(self, 24))
+        self.amount_entry.pack(pady=5)
+        self.amount_entry.focus()
+        self.amount_entry.bind("<Return>", self.calculate_change)
+        self.amount_entry.bind("<KP_Enter>", self.calculate_change)
+
+        # Inline validation message, quicker to clear than a modal dialog
+        self.error_label = ttk.Label(main_frame, text="", style="Error.TLabel")
+        self.error_label.pack()
+
+        self.calculate_button = ttk.Button(
+            main_frame,
+            text="Calcular Cambio",
+            command=self.calculate_change,
+            style="Green.Payment.TButton",
+        )
+        self.calculate_button.pack(pady=(10, 10))
+
+        self.cancel_button = ttk.Button(
+            main_frame,
+            text="Esc - Cancelar",
+            command=self.cancel,
+            style="Red.Payment.TButton",
+        )
+        self.cancel_button.pack(pady=(0, 25))
+
+        # Bind Escape key
+        self.bind("<Escape>", self.cancel)
+
+        self.change_label = ttk.Label(
+            main_frame,
+            text="",
+            style="Success.TLabel",
+            font=dialog_font(self, 36, "bold"),
+        )
+        self.change_label.pack(pady=15)
+
+        # Action buttons, packed by show_action_buttons after calculating change
+        # Print Ticket button (F2 - Green)
         self.print_button = ttk.Button(
             main_frame,
             text="F2 - Imprimir Ticket",
             command=self.print_and_finalize,
-            style="PaymentGreen.TButton",
+            style="Green.Payment.TButton",
         )
-        self.print_button.pack(pady=(15, 8))
-
-        # Create Close button (Ent - Blue)
+        # Close button (Ent - Blue)
         self.close_button = ttk.Button(
             main_frame,
             text="Ent - Cerrar",
             command=self.finalize_sale,
-            style="PaymentBlue.TButton",
+            style="Blue.Payment.TButton",
         )
+
+    def get_ticket_template(self):
+        """Return the ticket HTML template as a string. Robust: embedded in code, no file dependency."""
+        return TICKET_TEMPLATE
+
+    def calculate_change(self, event=None):
+        """Calculate change and enable print/finalize if sufficient."""
+        amount_paid = parse_amount(self.amount_entry.get())
+        if amount_paid is None:
+            self.error_label.config(
+                text="Monto inválido. Por favor, ingrese un número."
+            )
+            return
+        self.amount_paid = amount_paid
+        if self.amount_paid < self.total:
+            self.error_label.config(text="El monto recibido es menor que el total.")
+            return
+        self.error_label.config(text="")
+        self.change_value = self.amount_paid - self.total
+        self.change_text = f"${self.change_value:.2f}"
+        self.change_label.config(text=f"Cambio: {self.change_text}")
+
+        # Disable entry and hide calculate button
+        self.amount_entry.config(state="disabled")
+        self.amount_entry.unbind("<Return>")
+        self.amount_entry.unbind("<KP_Enter>")
+        self.calculate_button.pack_forget()
+        self.cancel_button.pack_forget()
+
+        # Create and show the action buttons
+        self.show_action_buttons()
+
+    def show_action_buttons(self):
+        """Show Print and Close buttons after calculating change."""
+        self.print_button.pack(pady=(15, 8))
         self.close_button.pack(pady=(8, 20))
 
         # Bind F2 to print and Enter to close
-        self.bind("<F2>", lambda e: self.print_and_finalize())
-        self.bind("<Return>", lambda e: self.finalize_sale())
-        self.bind("<KP_Enter>", lambda e: self.finalize_sale())
+        self.bind("<F2>", self.print_and_finalize)
+        self.bind("<Return>", self.finalize_sale)
+        self.bind("<KP_Enter>", self.finalize_sale)
 
     def print_ticket(self):
         """Print ticket using ThermalPrinter or fallback to HTML."""
-        # Data preparation
-        business_info = {
-            'name': self.parent.settings["business_name"],
-            'address': self.parent.settings["address"],
-            'phone': self.parent.settings["phone"],
-            'cashier': self.parent.settings["cashier_name"],
-            'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        items = []
-        for item in self.parent.sale_items.values():
-            items.append({
-                'name': item["name"],
-                'qty': item["qty"],
-                'price': item["price"]
-            })
-            
-        totals = {
-            'total': self.total,
-            'paid': self.amount_paid,
-            'change': self.change_value
-        }
+        settings = self.parent.settings
+        sale_items = list(self.parent.sale_items.values())
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Try Thermal Printer first
         if ThermalPrinter:
+            # Data preparation, only needed by the thermal printer
+            business_info = {
+                'name': settings["business_name"],
+                'address': settings["address"],
+                'phone': settings["phone"],
+                'cashier': settings["cashier_name"],
+                'date': timestamp
+            }
+
+            items = []
+            for item in sale_items:
+                items.append({
+                    'name': item["name"],
+                    'qty': item["qty"],
+                    'price': item["price"] / 100
+                })
+
+            totals = {
+                'total': self.total,
+                'paid': self.amount_paid,
+                'change': self.change_value
+            }
+
             try:
                 printer = ThermalPrinter()
                 printer.print_ticket(business_info, items, totals)
@@ -1089,40 +1421,37 @@ class PaymentWindow(tk.Toplevel):
         ticket_template = self.get_ticket_template()
 
         # Prepare items HTML with proper escaping
-        items_html = ""
-        for item in self.parent.sale_items.values():
-            name = (
-                item["name"]
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;")
-            )
-            subtotal = item["price"] * item["qty"]
-            items_html += f'<tr><td>{name} (x{item["qty"]})</td><td style="text-align: right;">${subtotal:.2f}</td></tr>'
+        items_html = "".join(
+            f'<tr><td>{html.escape(item["name"])} (x{item["qty"]})</td>'
+            f'<td style="text-align: right;">'
+            f'${item["price"] * item["qty"] / 100:.2f}</td></tr>'
+            for item in sale_items
+        )
 
         if not items_html:
             items_html = '<tr><td colspan="2">No hay ítems</td></tr>'
 
         # Header info
         header_info = f"""
-            <div>{self.parent.settings["address"]}</div>
-            <div>{self.parent.settings["phone"]}</div>
-            <div>Cajero: {self.parent.settings["cashier_name"]}</div>
-            <div>{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</div>
+            <div>{html.escape(settings["address"])}</div>
+            <div>{html.escape(settings["phone"])}</div>
+            <div>Cajero: {html.escape(settings["cashier_name"])}</div>
+            <div>{timestamp}</div>
         """
 
         # Totals block
         totals_block = f"""
-            <div class="total">Total: ${self.total:.2f}</div>
+            <div class="total">Total: {self.total_text}</div>
             <div class="total">Recibido: ${self.amount_paid:.2f}</div>
-            <div class="total">Cambio: ${self.change_value:.2f}</div>
+            <div class="total">Cambio: {self.change_text}</div>
         """
 
         # Logo
         logo_html = ""
-        logo_path = self.parent.settings.get("logo_path")
+        logo_path = settings.get("logo_path")
         if logo_path and Path(logo_path).exists():
+            import base64
+
             try:
                 with open(logo_path, "rb") as image_file:
                     encoded_string = base64.b64encode(image_file.read()).decode()
@@ -1139,23 +1468,36 @@ class PaymentWindow(tk.Toplevel):
                 print(f"Warning: Could not embed logo: {e}")
         # If no logo, just empty
 
-        # Replace placeholders
-        ticket_html = ticket_template.replace(
-            "{{business_name}}", self.parent.settings["business_name"]
+        # Replace placeholders in a single pass over the template
+        fields = {
+            "business_name": html.escape(settings["business_name"]),
+            "header_info": header_info,
+            "items": items_html,
+            "totals": totals_block,
+            "logo": logo_html,
+        }
+        ticket_html = TICKET_PLACEHOLDER_RE.sub(
+            lambda match: fields.get(match[1], match[0]), ticket_template
         )
-        ticket_html = ticket_html.replace("{{header_info}}", header_info)
-        ticket_html = ticket_html.replace("{{items}}", items_html)
-        ticket_html = ticket_html.replace("{{totals}}", totals_block)
-        ticket_html = ticket_html.replace("{{logo}}", logo_html)
 
         # Save to temp file and open in browser
+        import webbrowser
+
         try:
-            ticket_file = tempfile.NamedTemporaryFile(
-                delete=False, suffix=".html", mode="w", encoding="utf-8"
-            )
-            ticket_file.write(ticket_html)
-            ticket_file.close()
-            webbrowser.open(f"file://{os.path.realpath(ticket_file.name)}")
+            fd, ticket_path = tempfile.mkstemp(suffix=".html")
+            try:
+                data = memoryview(ticket_html.encode("utf-8"))
+                while data:
+                    data = data[os.write(fd, data) :]
+            finally:
+                os.close(fd)
+            # Launching the browser can block for a while (xdg-open), so it
+            # runs off the Tk thread while the sale is finalized
+            threading.Thread(
+                target=webbrowser.open,
+                args=(f"file://{os.path.realpath(ticket_path)}",),
+                daemon=True,
+            ).start()
             # Optional: clean up after delay, but let user handle
         except Exception as e:
             messagebox.showerror(
@@ -1163,12 +1505,16 @@ class PaymentWindow(tk.Toplevel):
             )
             return
 
-    def print_and_finalize(self):
+    def cancel(self, event=None):
+        """Close the payment window without finalizing the sale."""
+        self.destroy()
+
+    def print_and_finalize(self, event=None):
         """Print the ticket and finalize the sale."""
         self.print_ticket()
         self.finalize_sale()
 
-    def finalize_sale(self):
+    def finalize_sale(self, event=None):
         """Finalize the sale and close window."""
         try:
             self.parent.update_inventory()
@@ -1208,10 +1554,10 @@ class EntryExitWindow(tk.Toplevel):
         self.create_widgets()
 
         # Bind F1 to save transaction
-        self.bind("<F1>", lambda event: self.save_transaction())
+        self.bind("<F1>", self.save_transaction)
         # Bind Enter keys to save transaction
-        self.bind("<Return>", lambda event: self.save_transaction())
-        self.bind("<KP_Enter>", lambda event: self.save_transaction())
+        self.bind("<Return>", self.save_transaction)
+        self.bind("<KP_Enter>", self.save_transaction)
 
     def create_styles(self):
         """Create custom styles for the window."""
@@ -1229,15 +1575,25 @@ class EntryExitWindow(tk.Toplevel):
         """Create entry/exit window widgets."""
         main_frame = ttk.Frame(self, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
+        # One stretching column: entries fill it, labels and button center
+        main_frame.columnconfigure(0, weight=1)
 
-        ttk.Label(main_frame, text="Monto:", font=("Arial", 16)).pack(pady=5)
-        self.amount_entry = ttk.Entry(main_frame, font=("Arial", 24))
-        self.amount_entry.pack(pady=5, fill=tk.X)
+        ttk.Label(main_frame, text="Monto:", font=dialog_font(self, 16)).grid(
+            row=0, column=0, pady=5
+        )
+        self.amount_entry = ttk.Entry(main_frame, font=dialog_font(self, 24))
+        self.amount_entry.grid(row=1, column=0, pady=5, sticky="ew")
         self.amount_entry.focus()
 
-        ttk.Label(main_frame, text="Concepto:", font=("Arial", 16)).pack(pady=5)
-        self.concept_entry = ttk.Entry(main_frame, font=("Arial", 24))
-        self.concept_entry.pack(pady=5, fill=tk.X)
+        ttk.Label(main_frame, text="Concepto:", font=dialog_font(self, 16)).grid(
+            row=2, column=0, pady=5
+        )
+        self.concept_entry = ttk.Entry(main_frame, font=dialog_font(self, 24))
+        self.concept_entry.grid(row=3, column=0, pady=5, sticky="ew")
+
+        # Inline validation message, quicker to clear than a modal dialog
+        self.error_label = ttk.Label(main_frame, text="", style="Error.TLabel")
+        self.error_label.grid(row=4, column=0)
 
         self.add_button = ttk.Button(
             main_frame,
@@ -1245,25 +1601,20 @@ class EntryExitWindow(tk.Toplevel):
             command=self.save_transaction,
             style="Blue.TButton",
         )
-        self.add_button.pack(pady=20)
+        self.add_button.grid(row=5, column=0, pady=20)
 
-    def save_transaction(self):
+    def save_transaction(self, event=None):
         """Save the transaction and close."""
         amount_str = self.amount_entry.get().strip()
         concept = self.concept_entry.get().strip()
 
         if not amount_str or not concept:
-            messagebox.showerror("Error", "Ambos campos son requeridos.", parent=self)
+            self.error_label.config(text="Ambos campos son requeridos.")
             return
 
-        try:
-            amount = float(amount_str)
-            if amount <= 0:
-                raise ValueError("Monto debe ser positivo.")
-        except ValueError:
-            messagebox.showerror(
-                "Error", "El monto debe ser un número positivo.", parent=self
-            )
+        amount = parse_amount(amount_str)
+        if amount is None or amount <= 0:
+            self.error_label.config(text="El monto debe ser un número positivo.")
             return
 
         self.parent.log_cash_flow(self.transaction_type, amount, concept)
@@ -1,12 +1,36 @@
+import functools
 import os
 from datetime import datetime
 
+
+def _buffered(method):
+    """Collect everything a print job writes and send it in one write.
+
+    The buffer is dropped even if building the job fails, so a later job
+    never starts with half a ticket in front of it. Device errors are
+    raised to the caller.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._buffer = bytearray()
+        try:
+            method(self, *args, **kwargs)
+            data = bytes(self._buffer)
+        finally:
+            self._buffer = None
+        self._write(data)
+    return wrapper
+
+
 class ThermalPrinter:
     def __init__(self, device_path="/dev/thermal_printer"):
         self.ESC = b'\x1b'
         self.GS = b'\x1d'
         self.device_path = device_path
-        
+        # Pending ESC/POS bytes while a ticket or report is being built;
+        # None means every command is sent to the device immediately
+        self._buffer = None
+
         # Auto-detect if configured path does not exist
         if not os.path.exists(self.device_path):
             import glob
@@ -19,11 +43,11 @@ class ThermalPrinter:
                 print(f"Warning: No printer found at {device_path} and no /dev/usb/lp* devices detected.")
 
     def _write(self, data):
-        try:
-            with open(self.device_path, 'wb') as f:
-                f.write(data)
-        except Exception as e:
-            print(f"Error printing to {self.device_path}: {e}")
+        if self._buffer is not None:
+            self._buffer += data
+            return
+        with open(self.device_path, 'wb') as f:
+            f.write(data)
 
     def init_printer(self):
         self._write(self.ESC + b'@')
@@ -59,6 +83,7 @@ class ThermalPrinter:
         # m=65 (feed and cut) usually works
         self._write(self.GS + b'V' + b'\x41' + b'\x00')
 
+    @_buffered
     def print_ticket(self, business_info, items, totals):
         """
         business_info: dict with 'name', 'address', 'phone', 'cashier', 'date'
@@ -82,7 +107,7 @@ class ThermalPrinter:
         self.set_align('left')
         self.print_line(f"{'Producto':<20} {'Precio':>10}")
         self.print_line("-" * 32)
-        
+
         for item in items:
             name = item['name'][:20] # Truncate name
             qty = item['qty']
@@ -109,6 +134,7 @@ class ThermalPrinter:
         self.feed(3)
         self.cut()
 
+    @_buffered
     def print_report(self, business_info, start_date, end_date, sales_data, cash_flow_data, totals):
         """
         Print sales report.
@@ -117,7 +143,7 @@ class ThermalPrinter:
         totals: dict {'sales', 'entries', 'exits', 'net'}
         """
         self.init_printer()
-        
+
         # Header
         self.set_align('center')
         self.set_bold(True)
@@ -126,27 +152,27 @@ class ThermalPrinter:
         self.print_line(f"{start_date} - {end_date}")
         self.print_line(datetime.now().strftime("%d/%m/%Y %H:%M:%S"))
         self.print_line("-" * 32)
-        
+
         # Sales
         self.set_align('center')
         self.set_bold(True)
         self.print_line("VENTAS")
         self.set_bold(False)
         self.set_align('left')
-        
+
         if not sales_data:
-             self.set_align('center')
-             self.print_line("No hay ventas")
-             self.set_align('left')
+            self.set_align('center')
+            self.print_line("No hay ventas")
+            self.set_align('left')
         else:
             for item in sales_data:
                 # item: {'time', 'name', 'qty', 'total'}
                 self.print_line(f"{item['name']} (x{item['qty']})")
                 # Indent time and total
                 self.print_line(f"  {item['time']}   {item['total']}")
-        
+
         self.print_line("-" * 32)
-        
+
         # Cash Flow
         self.set_align('center')
         self.set_bold(True)
@@ -155,9 +181,9 @@ class ThermalPrinter:
         self.set_align('left')
 
         if not cash_flow_data:
-             self.set_align('center')
-             self.print_line("No hay movimientos")
-             self.set_align('left')
+            self.set_align('center')
+            self.print_line("No hay movimientos")
+            self.set_align('left')
         else:
             for item in cash_flow_data:
                 # item: {'time', 'type', 'amount', 'concept'}
@@ -175,7 +201,7 @@ class ThermalPrinter:
         self.print_line(f"Total Salidas: {totals['exits']}")
         self.print_line(f"TOTAL GENERAL: {totals['net']}")
         self.set_bold(False)
-        
+
         # Footer
         self.set_align('center')
         self.feed(1)